@@ -1,9 +1,13 @@
 import abc
+import sys
 
+import numba as nb
 import numpy as np
 import scipy.sparse as sparse
 from pyproprop import Options, processed_property
 
+from .utils import cachedproperty
+
 
 BOUNDS = "bounds"
 GUESS = "guess"
@@ -64,16 +68,17 @@ class PhaseScaling(ScalingABC):
 
 class Scaling(ScalingABC):
 
+    _GENERATE_DISPATCHER = {
+        None: "_generate_none",
+        NONE: "_generate_none",
+        USER: "_generate_user",
+        BOUNDS: "_generate_bounds",
+        GUESS: "_generate_guess",
+    }
+
     def __init__(self, backend):
         self.backend = backend
         self.ocp = backend.ocp
-        self._GENERATE_DISPATCHER = {
-            None: self._generate_none,
-            NONE: self._generate_none,
-            USER: self._generate_user,
-            BOUNDS: self._generate_bounds,
-            GUESS: self._generate_guess,
-        }
         self._generate()
 
     @property
@@ -82,44 +87,236 @@ class Scaling(ScalingABC):
 
     def _generate(self):
         method = self.ocp.settings.scaling_method
-        self.x_scales, self.x_shifts = self._GENERATE_DISPATCHER[method]()
+        generate = getattr(self, self._GENERATE_DISPATCHER[method])
+        self.x_scales, self.x_shifts = generate()
+        self.c_x_indices = self._generate_constraint_variable_indices()
         self.c_scales = self._generate_constraint_base()
 
     def _generate_bounds(self):
         x_l = self.backend.bounds.x_bnd_lower
         x_u = self.backend.bounds.x_bnd_upper
-        scales = (x_u - x_l)
-        shifts = x_u - (x_u - x_l) / 2
+        scales = np.subtract(x_u, x_l)
+        shifts = np.multiply(scales, -0.5)
+        shifts += x_u
         return scales, shifts
 
     def _generate_guess(self):
         raise NotImplementedError
 
     def _generate_none(self):
+        """Unit scales and zero shifts as read-only zero-copy views.
+
+        Consumers that need to modify the basis scaling (e.g.
+        :class:`IterationScaling`) take a copy first.
+
+        """
         num_needed = self.backend.num_var
-        scales = self._SCALE_DEFAULT * np.ones(num_needed)
-        shifts = self._SHIFT_DEFAULT * np.ones(num_needed)
+        scales = np.broadcast_to(np.float64(self._SCALE_DEFAULT), num_needed)
+        shifts = np.broadcast_to(np.float64(self._SHIFT_DEFAULT), num_needed)
         return scales, shifts
 
     def _generate_user(self):
         raise NotImplementedError
 
-    def _generate_constraint_base(self):
-        scales = np.ones(self.backend.num_c)
+    def _generate_constraint_variable_indices(self):
+        """Map defect/integral constraints to the variables that scale them.
+
+        Defect constraints are scaled by their corresponding state variable and
+        integral constraints by their corresponding integral variable. This
+        mapping is fixed for the OCP so is built once as a pair of index
+        arrays that can be used to scatter variable scalings in to the
+        constraint scalings in a single vectorised operation.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Constraint indices and the variable indices that scale them.
+
+        """
+        c_indices = np.arange(self.backend.num_c)
+        x_indices = np.arange(self.backend.num_var)
+        c_parts = []
+        x_parts = []
         slices = zip(self.backend.phase_y_var_slices,
                      self.backend.phase_q_var_slices,
                      self.backend.phase_y_eqn_slices,
                      self.backend.phase_q_fnc_slices)
         for y_slice, q_slice, y_eqn_slice, q_fnc_slice in slices:
-            scales[y_eqn_slice] = self.x_scales[y_slice]
-            scales[q_fnc_slice] = self.x_scales[q_slice]
+            c_parts.extend([c_indices[y_eqn_slice], c_indices[q_fnc_slice]])
+            x_parts.extend([x_indices[y_slice], x_indices[q_slice]])
+        c_indices = np.concatenate(c_parts) if c_parts else c_indices[:0]
+        x_indices = np.concatenate(x_parts) if x_parts else x_indices[:0]
+        return c_indices, x_indices
+
+    def _generate_constraint_base(self):
+        scales = np.ones(self.backend.num_c)
+        c_indices, x_indices = self.c_x_indices
+        scales[c_indices] = self.x_scales[x_indices]
         return scales
 
 
 def np_print(to_print):
-    for val in to_print:
-        prefix = "-" if val < 0 else "+"
-        print(f"{prefix}{np.abs(val):.15e},")
+    if not isinstance(to_print, np.ndarray):
+        to_print = np.fromiter(to_print, dtype=np.float64)
+    # Adding zero maps -0.0 to +0.0 so that zeros are always printed with "+"
+    to_print = np.asarray(to_print, dtype=np.float64).reshape(-1, 1) + 0.0
+    np.savetxt(sys.stdout, to_print, fmt="%+.15e,")
+
+
+@nb.njit(cache=True)
+def _column_amplitude_centre(var, amp, centre):
+    """Per-column amplitude and centre of a 2D array in a single pass.
+
+    Rows are traversed in memory order maintaining running minima and maxima
+    for each column. Columns with zero amplitude (i.e. constant values) are
+    given a unit amplitude so that the resulting stretch is always invertible.
+
+    Parameters
+    ----------
+    var : np.ndarray
+        2D array of values, shape (num_rows, num_cols).
+    amp : np.ndarray
+        Output array for the column amplitudes (`max - min`), shape
+        (num_cols, ).
+    centre : np.ndarray
+        Output array for the column centres (`max - 0.5 * amp`), shape
+        (num_cols, ).
+
+    """
+    num_rows, num_cols = var.shape
+    var_min = var[0].copy()
+    var_max = var[0].copy()
+    for i in range(1, num_rows):
+        for j in range(num_cols):
+            val = var[i, j]
+            if val < var_min[j]:
+                var_min[j] = val
+            elif val > var_max[j]:
+                var_max[j] = val
+    for j in range(num_cols):
+        var_amp = var_max[j] - var_min[j]
+        centre[j] = var_max[j] - 0.5 * var_amp
+        amp[j] = var_amp if var_amp > 0.0 else 1.0
+
+
+@nb.njit(cache=True)
+def _row_sum_squares(row, data, out):
+    """Sum of squared nonzeros in each row of a sparse matrix.
+
+    The nonzeros can be in any order (CasADi provides them column-major) so
+    they are scatter-added to their rows, squaring on the fly, in a single
+    pass without any intermediate squared copy of `data`.
+
+    Parameters
+    ----------
+    row : np.ndarray
+        Row index of each nonzero.
+    data : np.ndarray
+        Nonzero values.
+    out : np.ndarray
+        Output array for the per-row sums, shape (num_rows, ).
+
+    """
+    out[:] = 0.0
+    for k in range(data.shape[0]):
+        out[row[k]] += data[k] * data[k]
+
+
+@nb.njit(cache=True)
+def _affine_scale(V_inv, r, x, out):
+    """Shift then stretch `x` to the tilde basis in a single pass.
+
+    Equivalent to `V_inv * (x - r)` without the intermediate `x - r` array.
+    The shift is subtracted before stretching, rather than folding the two in
+    to `V_inv * x - V_inv * r`, to avoid cancellation when `|r| >> V`.
+
+    """
+    for i in range(x.shape[0]):
+        out[i] = (x[i] - r[i]) * V_inv[i]
+
+
+@nb.njit(cache=True)
+def _affine_unscale(V, r, x_tilde, out):
+    """Stretch then shift `x_tilde` to the user basis in a single pass.
+
+    Equivalent to `V * x_tilde + r` without the intermediate `V * x_tilde`
+    array.
+
+    """
+    for i in range(x_tilde.shape[0]):
+        out[i] = V[i] * x_tilde[i] + r[i]
+
+
+@nb.njit(cache=True)
+def _expand_by_table(table, base, out):
+    """Expand basis scaling to a mesh by repeating contiguous blocks.
+
+    Parameters
+    ----------
+    table : np.ndarray
+        Integer array, shape (num_blocks, 4), with each row
+        `(ocp_start, ocp_stop, start, num_repeat)`. Each basis value in
+        `base[ocp_start:ocp_stop]` is written `num_repeat` times in turn to
+        `out` starting from index `start`.
+    base : np.ndarray
+        Basis scaling values.
+    out : np.ndarray
+        Output array for the expanded scaling values.
+
+    """
+    for k in range(table.shape[0]):
+        ocp_start = table[k, 0]
+        ocp_stop = table[k, 1]
+        start = table[k, 2]
+        num_repeat = table[k, 3]
+        for i in range(ocp_stop - ocp_start):
+            val = base[ocp_start + i]
+            offset = start + i * num_repeat
+            for j in range(num_repeat):
+                out[offset + j] = val
+
+
+@nb.njit(cache=True)
+def _scale_compressed(indptr, indices, data, outer, inner, out):
+    """Scale the nonzeros of a CSR/CSC matrix by two diagonals in one pass.
+
+    For CSR `outer` scales the rows and `inner` the columns, i.e. the
+    nonzeros of `diag(outer) @ A @ diag(inner)`; for CSC the roles are
+    swapped. `out` may be `data` to scale in place.
+
+    Parameters
+    ----------
+    indptr : np.ndarray
+        Compressed index pointer array, shape (num_outer + 1, ).
+    indices : np.ndarray
+        Inner (column for CSR, row for CSC) index of each nonzero.
+    data : np.ndarray
+        Nonzero values.
+    outer : np.ndarray
+        Scaling values for each row (CSR) or column (CSC).
+    inner : np.ndarray
+        Scaling values for each column (CSR) or row (CSC).
+    out : np.ndarray
+        Output array for the scaled nonzeros, same shape as `data`.
+
+    """
+    for i in range(indptr.shape[0] - 1):
+        scale = outer[i]
+        for k in range(indptr[i], indptr[i + 1]):
+            out[k] = data[k] * scale * inner[indices[k]]
+
+
+def _identity(arg, out=None):
+    """Identity transform used in place of a scaling when it would be one.
+
+    `arg` is returned unchanged, or copied in to (and returned as) `out` if
+    this is supplied.
+
+    """
+    if out is None:
+        return arg
+    out[...] = arg
+    return out
 
 
 class IterationScaling:
@@ -132,24 +329,44 @@ class IterationScaling:
     backend : Union[CasadiBackend, HsadBackend, PycolloBackend, SympyBackend]
         The Pycollo backend for the optimal control problem.
     _GENERATE_DISPATCHER : dict
-        Dispatcher for the scaling generation method depending on the option
-        settings.
-    _V : np.ndarray
-        Variable stretch values.
-    _r : np.ndarray
-        Variable shift values.
-    _V_inv : np.ndarray
-        Variable unstretch values. Reciprocal of :attr:`_V`.
+        Class-level map from the `update_scaling` option setting to the name
+        of the scaling generation method to dispatch to.
+    _IDENTITY_TRANSFORMS : dict
+        Class-level map from the names of the methods that depend only on the
+        variable stretch/shift to the identity transform used in their place
+        when no variable scaling is used.
+    _V : Union[np.ndarray, float]
+        Variable stretch values. A scalar if no variable scaling is used.
+    _r : Union[np.ndarray, float]
+        Variable shift values. A scalar if no variable scaling is used.
+    _V_inv : Union[np.ndarray, float]
+        Variable unstretch values. Reciprocal of :attr:`_V`, computed once
+        when the stretch values are set.
+    _w_running : float
+        Weighted sum of this and all previous iterations' objective scalings,
+        as required by the next mesh iteration when updating scaling.
+    _V_ocp_running : np.ndarray
+        As :attr:`_w_running` but for the basis variable stretch values.
+    _r_ocp_running : np.ndarray
+        As :attr:`_w_running` but for the basis variable shift values.
+    _W_ocp_running : np.ndarray
+        As :attr:`_w_running` but for the basis constraint scaling values.
 
     """
 
+    _GENERATE_DISPATCHER = {
+        True: "_generate_from_previous",
+        False: "_generate_from_base",
+    }
+    _IDENTITY_TRANSFORMS = {
+        "scale_x": _identity,
+        "unscale_x": _identity,
+        "scale_H": sparse.csr_matrix,
+    }
+
     def __init__(self, iteration):
         self.iteration = iteration
         self.backend = self.iteration.backend
-        self._GENERATE_DISPATCHER = {
-            True: self._generate_from_previous,
-            False: self._generate_from_base,
-        }
         self._initialise_variable_scaling()
 
     @property
@@ -163,20 +380,94 @@ class IterationScaling:
         return self.optimal_control_problem._backend.scaling
 
     def _initialise_variable_scaling(self):
-        """Expand basis shift/stretch scaling to initial mesh."""
+        """Expand basis shift/stretch scaling to initial mesh.
+
+        Without variable scaling the stretch/shift are the identity so are
+        stored as scalars rather than as mesh-sized arrays of ones and zeros.
+        The transforms that depend only on these, :meth:`scale_x`,
+        :meth:`unscale_x` and :meth:`scale_H`, are then rebound to the
+        identity for this instance so that they cost nothing per call (the
+        Hessian is still returned in CSR format, as when scaling). These are
+        restored if stretch/shift values are later expanded to the mesh,
+        i.e. when scaling is updated from the previous iteration.
+
+        If scaling is not being updated then the expanded stretch/shift
+        depend only on the number of mesh nodes in each phase, so when these
+        are unchanged from the previous mesh iteration its (read-only) arrays
+        are shared rather than being recomputed.
+
+        """
         self.V_ocp = self.base_scaling.x_scales.copy()
         self.r_ocp = self.base_scaling.x_shifts.copy()
-        self.V = self._expand_x_to_mesh(self.V_ocp)
-        self.r = self._expand_x_to_mesh(self.r_ocp)
-        self.V_inv = np.reciprocal(self.V)
+        prev_scaling = self._previous_iteration_scaling()
+        settings = self.optimal_control_problem.settings
+        if settings.scaling_method in {None, NONE}:
+            self.V = float(self.base_scaling._SCALE_DEFAULT)
+            self.V_inv = 1 / self.V
+            self.r = float(self.base_scaling._SHIFT_DEFAULT)
+            for name, transform in self._IDENTITY_TRANSFORMS.items():
+                setattr(self, name, transform)
+        elif (prev_scaling is not None and not settings.update_scaling
+                and prev_scaling._mesh_N == self._mesh_N):
+            self.V = prev_scaling.V
+            self.V_inv = prev_scaling.V_inv
+            self.r = prev_scaling.r
+        else:
+            self._expand_V_r_to_mesh()
+
+    def _expand_V_r_to_mesh(self):
+        """Expand basis stretch/shift in to one contiguous block.
+
+        :attr:`V`, :attr:`V_inv` and :attr:`r` are the rows of a single
+        allocation rather than separate arrays, with the reciprocal of the
+        stretch values computed once here rather than on every use. Any identity
+        transforms bound to this instance when not scaling are dropped so
+        that the expanded values are applied.
+
+        """
+        for name in self._IDENTITY_TRANSFORMS:
+            self.__dict__.pop(name, None)
+        V_block = np.empty((3, self.iteration.num_x))
+        self.V = self._expand_x_to_mesh(self.V_ocp, out=V_block[0])
+        self.V_inv = np.reciprocal(self.V, out=V_block[1])
+        self.r = self._expand_x_to_mesh(self.r_ocp, out=V_block[2])
+        for row in (self.V, self.V_inv, self.r):
+            row.flags.writeable = False
+
+    @property
+    def _mesh_N(self):
+        """Number of mesh nodes per phase, identifying the mesh's layout."""
+        return tuple(self.iteration.mesh.N)
 
-    def scale_x(self, x):
-        x_tilde = np.multiply(self.V_inv, (x - self.r))
-        return x_tilde
+    def scale_x(self, x, out=None):
+        """Convert variables from the user to the tilde basis.
 
-    def unscale_x(self, x_tilde):
-        x = np.multiply(self.V, x_tilde) + self.r
-        return x
+        A new array is returned unless `out` is supplied, in which case the
+        result is written to (and returned as) `out`.
+
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if out is None:
+            out = np.empty_like(x)
+        V_inv = np.broadcast_to(self.V_inv, x.shape)
+        r = np.broadcast_to(self.r, x.shape)
+        _affine_scale(V_inv, r, x, out)
+        return out
+
+    def unscale_x(self, x_tilde, out=None):
+        """Convert variables from the tilde to the user basis.
+
+        A new array is returned unless `out` is supplied, in which case the
+        result is written to (and returned as) `out`.
+
+        """
+        x_tilde = np.asarray(x_tilde, dtype=np.float64)
+        if out is None:
+            out = np.empty_like(x_tilde)
+        V = np.broadcast_to(self.V, x_tilde.shape)
+        r = np.broadcast_to(self.r, x_tilde.shape)
+        _affine_unscale(V, r, x_tilde, out)
+        return out
 
     def scale_sigma(self, sigma_tilde):
         raise NotImplementedError
@@ -189,18 +480,55 @@ class IterationScaling:
         J = (1 / self.w) * J_tilde
         return J
 
-    def scale_g(self, g):
-        raise NotImplementedError
+    def scale_g(self, g, out=None):
+        """Scale the objective gradient from the user to the tilde basis.
+
+        As `J_tilde = w * J` and `x = V * x_tilde + r`, the scaled gradient is
+        `w * V * g`, computed element-wise. A new array is returned unless
+        `out` is supplied, in which case the result is written to (and
+        returned as) `out`.
+
+        """
+        g_tilde = np.multiply(self.V, g, out=out)
+        np.multiply(self.w, g_tilde, out=g_tilde)
+        return g_tilde
 
     def scale_c(self, c):
         c_tilde = np.multiply(self.W, c)
         return c_tilde
 
     def scale_G(self, sG):
-        raise NotImplementedError
+        """Scale the constraint Jacobian from the user to the tilde basis.
+
+        As `x = V * x_tilde + r` and `c_tilde = W * c`, the scaled Jacobian is
+        `diag(W) @ G @ diag(V)`. The Jacobian is copied to CSC format, in
+        which each column's nonzeros are contiguous, and both scalings are
+        applied to its nonzeros in place in a single pass. The matrix is
+        never densified and is returned in CSC format.
+
+        """
+        sG_tilde = sparse.csc_matrix(sG, copy=True)
+        V = np.broadcast_to(self.V, sG_tilde.shape[1])
+        _scale_compressed(sG_tilde.indptr, sG_tilde.indices, sG_tilde.data,
+                          V, self.W, sG_tilde.data)
+        return sG_tilde
 
     def scale_H(self, sH):
-        raise NotImplementedError
+        """Scale the Lagrangian Hessian from the user to the tilde basis.
+
+        The objective factor and Lagrange multipliers are scaled separately
+        so only the variable scaling remains, i.e. `diag(V) @ H @ diag(V)`.
+        The sparsity structure is unchanged by this scaling so the CSR
+        `indices` and `indptr` arrays are reused and only a new `data` array
+        is computed, in a single pass over the nonzeros.
+
+        """
+        sH = sparse.csr_matrix(sH)
+        V = np.broadcast_to(self.V, sH.shape[0])
+        data = np.empty_like(sH.data)
+        _scale_compressed(sH.indptr, sH.indices, sH.data, V, V, data)
+        return sparse.csr_matrix((data, sH.indices, sH.indptr),
+                                 shape=sH.shape)
 
     def generate_J_c_scaling(self):
         """Generate scaling factors for the objective and constraints."""
@@ -208,11 +536,56 @@ class IterationScaling:
             self._generate_first_iteration()
         else:
             use_update = self.optimal_control_problem.settings.update_scaling
-            self._GENERATE_DISPATCHER[use_update]()
+            getattr(self, self._GENERATE_DISPATCHER[use_update])()
+        self._update_running_scaling()
+
+    def _update_running_scaling(self):
+        """Carry forward the weighted scaling history for the next iteration.
 
-    def _expand_x_to_mesh(self, base_scaling):
-        """Expand basis scaling (OCP variables) to iteration variables."""
-        scaling = np.empty(self.iteration.num_x)
+        Scaling updates use an exponentially-weighted average of every mesh
+        iteration's scalings, with weight `alpha` on the newest and
+        `(1 - alpha)**n` on the oldest. Rather than restack the full history
+        each iteration, the weighted sum of all scalings up to and including
+        this iteration is stored, already discounted for the next iteration,
+        so that the next average is `running + alpha * latest`.
+
+        """
+        alpha = self.optimal_control_problem.settings.scaling_weight
+        prev_scaling = self._previous_iteration_scaling()
+        if prev_scaling is None:
+            self._w_running = (1 - alpha) * self.w
+            self._V_ocp_running = (1 - alpha) * self.V_ocp
+            self._r_ocp_running = (1 - alpha) * self.r_ocp
+            self._W_ocp_running = (1 - alpha) * self.W_ocp
+        else:
+            self._w_running = (1 - alpha) * (
+                prev_scaling._w_running + alpha * self.w)
+            self._V_ocp_running = (1 - alpha) * (
+                prev_scaling._V_ocp_running + alpha * self.V_ocp)
+            self._r_ocp_running = (1 - alpha) * (
+                prev_scaling._r_ocp_running + alpha * self.r_ocp)
+            self._W_ocp_running = (1 - alpha) * (
+                prev_scaling._W_ocp_running + alpha * self.W_ocp)
+
+    def _previous_iteration_scaling(self):
+        """Scaling of the preceding mesh iteration, or `None` if first."""
+        if self.iteration.number == 1 or not self.backend.mesh_iterations:
+            return None
+        return self.backend.mesh_iterations[self.iteration.index - 1].scaling
+
+    @cachedproperty
+    def _expand_x_table(self):
+        """Table of contiguous blocks expanding basis to iteration variables.
+
+        Each row is `(ocp_start, ocp_stop, start, num_repeat)`: the basis
+        variables `ocp_start:ocp_stop` each have their scaling repeated
+        `num_repeat` times in turn from iteration variable `start`. State and
+        control variables are repeated for each of their phase's `N` mesh
+        nodes while integral, time and static parameter variables map
+        one-to-one. See :func:`_expand_by_table`.
+
+        """
+        table = []
         zip_args = zip(self.backend.phase_y_var_slices,
                        self.backend.phase_u_var_slices,
                        self.backend.phase_q_var_slices,
@@ -232,18 +605,29 @@ class IterationScaling:
             q_slice = values[6]
             t_slice = values[7]
             N = values[8]
-            scaling[y_slice] = np.repeat(base_scaling[ocp_y_slice], N)
-            scaling[u_slice] = np.repeat(base_scaling[ocp_u_slice], N)
-            scaling[q_slice] = base_scaling[ocp_q_slice]
-            scaling[t_slice] = base_scaling[ocp_t_slice]
+            table.append((ocp_y_slice.start, ocp_y_slice.stop, y_slice.start,
+                          N))
+            table.append((ocp_u_slice.start, ocp_u_slice.stop, u_slice.start,
+                          N))
+            table.append((ocp_q_slice.start, ocp_q_slice.stop, q_slice.start,
+                          1))
+            table.append((ocp_t_slice.start, ocp_t_slice.stop, t_slice.start,
+                          1))
         ocp_s_slice = self.backend.s_var_slice
         s_slice = self.iteration.s_slice
-        scaling[s_slice] = base_scaling[ocp_s_slice]
-        return scaling
+        table.append((ocp_s_slice.start, ocp_s_slice.stop, s_slice.start, 1))
+        return np.array(table, dtype=np.int64)
 
-    def _expand_c_to_mesh(self, base_scaling):
-        """Expand basis scaling (OCP constraints) to iteration constraints."""
-        scaling = np.empty(self.iteration.num_c)
+    @cachedproperty
+    def _expand_c_table(self):
+        """Table of contiguous blocks expanding basis to iteration constraints.
+
+        As :attr:`_expand_x_table`. Defect constraints are repeated for each
+        of their phase's defect nodes and path constraints for each mesh
+        node. Integral and endpoint constraints map one-to-one.
+
+        """
+        table = []
         zip_args = zip(self.backend.phase_y_eqn_slices,
                        self.backend.phase_p_con_slices,
                        self.backend.phase_q_fnc_slices,
@@ -261,12 +645,41 @@ class IterationScaling:
             i_slice = values[5]
             num_d = values[6]
             N = values[7]
-            scaling[d_slice] = np.repeat(base_scaling[ocp_d_slice], num_d)
-            scaling[p_slice] = np.repeat(base_scaling[ocp_p_slice], N)
-            scaling[i_slice] = base_scaling[ocp_q_slice]
+            table.append((ocp_d_slice.start, ocp_d_slice.stop, d_slice.start,
+                          num_d))
+            table.append((ocp_p_slice.start, ocp_p_slice.stop, p_slice.start,
+                          N))
+            table.append((ocp_q_slice.start, ocp_q_slice.stop, i_slice.start,
+                          1))
         ocp_e_slice = self.backend.c_endpoint_slice
         e_slice = self.iteration.c_endpoint_slice
-        scaling[e_slice] = base_scaling[ocp_e_slice]
+        table.append((ocp_e_slice.start, ocp_e_slice.stop, e_slice.start, 1))
+        return np.array(table, dtype=np.int64)
+
+    def _expand_x_to_mesh(self, base_scaling, out=None):
+        """Expand basis scaling (OCP variables) to iteration variables.
+
+        The expansion is a single compiled pass over :attr:`_expand_x_table`,
+        written directly in to the preallocated output.
+
+        Parameters
+        ----------
+        base_scaling : np.ndarray
+            Scaling values for the OCP (basis) variables.
+        out : np.ndarray, optional
+            Array of length `iteration.num_x` to write the expanded scaling
+            in to. A new array is allocated if not supplied.
+
+        """
+        if out is None:
+            out = np.empty(self.iteration.num_x)
+        _expand_by_table(self._expand_x_table, base_scaling, out)
+        return out
+
+    def _expand_c_to_mesh(self, base_scaling):
+        """Expand basis scaling (OCP constraints) to iteration constraints."""
+        scaling = np.empty(self.iteration.num_c)
+        _expand_by_table(self._expand_c_table, base_scaling, scaling)
         return scaling
 
     def _generate_first_iteration(self):
@@ -283,28 +696,19 @@ class IterationScaling:
 
     def _generate_from_previous(self):
         """Generate objective/constraint scaling from previous iteration."""
-        w = self._calculate_objective_scaling(self.iteration.guess_x)
-        prev_w = [mesh_iter.scaling.w
-                  for mesh_iter in self.backend.mesh_iterations]
-        w_all = np.concatenate([prev_w, np.array([w])])
+        prev_scaling = self._previous_iteration_scaling()
         alpha = self.optimal_control_problem.settings.scaling_weight
-        weights = np.array([alpha * (1 - alpha)**i
-                            for i, _ in enumerate(w_all)])
-        weights = np.flip(weights)
-        weights[0] /= alpha
-        self.w = np.average(w_all, weights=weights)
+        w = self._calculate_objective_scaling(self.iteration.guess_x)
+        self.w = prev_scaling._w_running + alpha * w
 
         def set_scales_shifts(ocp_var_slice, var_slice, N=None):
             var = self.iteration.guess_x[var_slice]
             if len(var) == 0:
                 pass
             elif N:
-                var = var.reshape(N, -1)
-                var_min = np.min(var, axis=0)
-                var_max = np.max(var, axis=0)
-                var_amp = var_max - var_min
-                self.V_ocp[ocp_var_slice] = var_amp
-                self.r_ocp[ocp_var_slice] = var_max - 0.5 * var_amp
+                _column_amplitude_centre(var.reshape(N, -1),
+                                         self.V_ocp[ocp_var_slice],
+                                         self.r_ocp[ocp_var_slice])
             else:
                 V_last = self.V_ocp[ocp_var_slice]
                 r_last = self.r_ocp[ocp_var_slice]
@@ -325,25 +729,28 @@ class IterationScaling:
             set_scales_shifts(self.backend.phase_q_var_slices[p.i], q_slice)
             set_scales_shifts(self.backend.phase_t_var_slices[p.i], t_slice)
         set_scales_shifts(self.backend.s_var_slice, self.iteration.s_slice)
-        prev_V = np.array([mesh_iter.scaling.V_ocp
-                           for mesh_iter in self.backend.mesh_iterations])
-        prev_r = np.array([mesh_iter.scaling.r_ocp
-                           for mesh_iter in self.backend.mesh_iterations])
-        V_all = np.vstack([prev_V, self.V_ocp.reshape(1, -1)])
-        r_all = np.vstack([prev_r, self.r_ocp.reshape(1, -1)])
-        self.V_ocp = np.average(V_all, axis=0, weights=weights)
-        self.r_ocp = np.average(r_all, axis=0, weights=weights)
-        self.V = self._expand_x_to_mesh(self.V_ocp)
-        self.r = self._expand_x_to_mesh(self.r_ocp)
-        self.V_inv = np.reciprocal(self.V)
+        self.V_ocp = prev_scaling._V_ocp_running + alpha * self.V_ocp
+        self.r_ocp = prev_scaling._r_ocp_running + alpha * self.r_ocp
+        self._expand_V_r_to_mesh()
 
         W = self._calculate_constraint_scaling(self.iteration.guess_x)
-        prev_W = np.array([mesh_iter.scaling.W_ocp
-                           for mesh_iter in self.backend.mesh_iterations])
-        W_all = np.vstack([prev_W, W])
-        self.W_ocp = np.average(W_all, axis=0, weights=weights)
+        self.W_ocp = prev_scaling._W_ocp_running + alpha * W
         self.W = self._expand_c_to_mesh(self.W_ocp)
 
+    @staticmethod
+    def _scaling_callable_args(x_guess, num_scaling):
+        """Arguments for a scaling callable with all scalings set to 1.0.
+
+        The arguments vector is allocated once and filled in place rather than
+        concatenating `x_guess` with a separately allocated array of ones.
+
+        """
+        num_x = x_guess.size
+        args = np.empty(num_x + num_scaling)
+        args[:num_x] = x_guess
+        args[num_x:] = 1.0
+        return args
+
     def _calculate_objective_scaling(self, x_guess):
         """Calculate objective function scaling value.
 
@@ -359,9 +766,10 @@ class IterationScaling:
         """
         if self.backend.ocp.settings.scaling_method is None:
             return 1
-        args = np.concatenate([x_guess, np.ones(1)])
+        args = self._scaling_callable_args(x_guess, 1)
         g = self.backend.g_iter_scale_callable(args)
-        g_norm = np.sqrt(np.sum(g**2))
+        g_nz = np.array(g.nonzeros(), dtype=np.float64)
+        g_norm = float(np.linalg.norm(g_nz))
         if np.isclose(g_norm, 0.0):
             obj_scaling = 1
         else:
@@ -387,49 +795,35 @@ class IterationScaling:
             The scaling factors (`W`) for the constraints vector (`c`).
 
         """
-        null_scaling = np.ones(self.backend.num_c)
         if self.backend.ocp.settings.scaling_method is None:
-            return null_scaling
-        args = np.concatenate([x_guess, null_scaling])
+            return np.ones(self.backend.num_c)
+        args = self._scaling_callable_args(x_guess, self.backend.num_c)
         G = self.backend.G_iter_scale_callable(args)
-        sG = sparse.coo_matrix(np.array(G))
-        G_norm = np.squeeze(np.sqrt(np.array(sG.power(2).sum(axis=1))))
+        G_row, G_shape = self._G_scale_structure
+        G_nz = np.array(G.nonzeros(), dtype=np.float64)
+        G_norm = np.empty(G_shape[0])
+        _row_sum_squares(G_row, G_nz, G_norm)
+        np.sqrt(G_norm, out=G_norm)
         ocp_c_scales = np.empty(self.backend.num_c)
-        zip_args = zip(
-            self.backend.phase_y_var_slices,
-            self.backend.phase_q_var_slices,
-            self.backend.phase_y_eqn_slices,
-            self.backend.phase_p_con_slices,
-            self.backend.phase_q_fnc_slices,
-            self.iteration.c_defect_slices,
-            self.iteration.c_path_slices,
-            self.iteration.c_integral_slices,
-            self.backend.p,
-            self.iteration.mesh.num_c_defect_per_y,
-            self.iteration.mesh.N)
-        for args in zip_args:
-            ocp_y_slice = args[0]
-            ocp_q_slice = args[1]
-            ocp_defect_slice = args[2]
-            ocp_path_slice = args[3]
-            ocp_integral_slice = args[4]
-            defect_slice = args[5]
-            path_slice = args[6]
-            integral_slice = args[7]
-            p = args[8]
-            n_defect = args[9]
-            N = args[10]
-            ocp_c_scales[ocp_defect_slice] = np.reciprocal(
-                self.V_ocp[ocp_y_slice])
+        c_indices, x_indices = self.base_scaling.c_x_indices
+        ocp_c_scales[c_indices] = np.reciprocal(self.V_ocp[x_indices])
+        zip_args = zip(self.backend.phase_p_con_slices,
+                       self.iteration.c_path_slices,
+                       self.backend.p,
+                       self.iteration.mesh.N)
+        for ocp_path_slice, path_slice, p, N in zip_args:
             ocp_c_scales[ocp_path_slice] = np.reciprocal(
                 np.mean(G_norm[path_slice].reshape(p.num_p_con, N), axis=1))
-            ocp_c_scales[ocp_integral_slice] = np.reciprocal(
-                self.V_ocp[ocp_q_slice])
         ocp_c_scales[self.backend.c_endpoint_slice] = np.reciprocal(
             G_norm[self.iteration.c_endpoint_slice])
         c_scales = ocp_c_scales
         return c_scales
 
+    @property
+    def _G_scale_structure(self):
+        """Sparsity of the constraint scaling Jacobian (backend-specific)."""
+        raise NotImplementedError
+
     def _generate_random_sample_variables(self):
         """Generate objective/constraint scaling from random sampling."""
         raise NotImplementedError
@@ -437,7 +831,28 @@ class IterationScaling:
 
 class CasadiIterationScaling(IterationScaling):
     """Subclass with CasADi backend-specific scaling overrides."""
-    pass
+
+    @cachedproperty
+    def _G_scale_structure(self):
+        """Sparsity of the constraint scaling Jacobian.
+
+        This is the Jacobian of :attr:`backend.G_iter_scale_callable` used to
+        calculate constraint scaling, not the NLP constraint Jacobian. Its
+        structure is fixed for a given mesh so it is only extracted from the
+        compiled CasADi function once per iteration.
+
+        Returns
+        -------
+        Tuple[np.ndarray, Tuple[int, int]]
+            Row indices of the structural nonzeros (in the same order as the
+            Jacobian's nonzero values) and the Jacobian shape.
+
+        """
+        sparsity = self.backend.G_iter_scale_callable.sparsity_out(0)
+        row, _ = sparsity.get_triplet()
+        row = np.array(row, dtype=np.int64)
+        shape = (sparsity.size1(), sparsity.size2())
+        return row, shape
 
 
 class HsadIterationScaling(IterationScaling):
@@ -1,8 +1,11 @@
 """Test creation and initialisation of Iteration objects."""
 
 
+from types import SimpleNamespace
+
 import numpy as np
 import pytest
+import scipy.sparse as sparse
 
 import pycollo
 
@@ -20,9 +23,8 @@ from .iteration_scaling_test_data_brachistochrone import (EXPECT_V_BR,
                                                           )
 
 
-@pytest.fixture
-def double_pendulum_initialised_fixture(double_pendulum_fixture):
-    ocp, _ = double_pendulum_fixture
+def initialise_first_iteration(ocp):
+    """Initialise `ocp` and create its (uninitialised) first mesh iteration."""
     ocp._console_out_initialisation_message()
     ocp._check_variables_and_equations()
     ocp._initialise_backend()
@@ -42,6 +44,13 @@ def double_pendulum_initialised_fixture(double_pendulum_fixture):
     iteration.prev_guess = ocp._backend.initial_guess
     iteration.interpolate_guess_to_mesh(iteration.prev_guess)
     iteration.create_variable_constraint_counts_slices()
+    return iteration
+
+
+@pytest.fixture
+def double_pendulum_initialised_fixture(double_pendulum_fixture):
+    ocp, _ = double_pendulum_fixture
+    iteration = initialise_first_iteration(ocp)
     scaling = object.__new__(pycollo.scaling.CasadiIterationScaling)
     return ocp, iteration, scaling
 
@@ -49,25 +58,7 @@ def double_pendulum_initialised_fixture(double_pendulum_fixture):
 @pytest.fixture
 def brachistochrone_initialised_fixture(brachistochrone_fixture):
     ocp, _ = brachistochrone_fixture
-    ocp._console_out_initialisation_message()
-    ocp._check_variables_and_equations()
-    ocp._initialise_backend()
-    ocp._check_problem_and_phase_bounds()
-    ocp._initialise_scaling()
-    ocp._initialise_quadrature()
-    ocp._postprocess_backend()
-    ocp._initialise_initial_mesh()
-    ocp._check_initial_guess()
-    ocp._backend.mesh_iterations = []
-    iteration = object.__new__(pycollo.iteration.Iteration)
-    iteration.backend = ocp._backend
-    iteration.ocp = ocp
-    iteration.index = 0
-    iteration.number = 1
-    iteration._mesh = ocp._backend.initial_mesh
-    iteration.prev_guess = ocp._backend.initial_guess
-    iteration.interpolate_guess_to_mesh(iteration.prev_guess)
-    iteration.create_variable_constraint_counts_slices()
+    iteration = initialise_first_iteration(ocp)
     scaling = object.__new__(pycollo.scaling.CasadiIterationScaling)
     return ocp, iteration, scaling
 
@@ -164,3 +155,149 @@ def test_initialise_scaling_br(brachistochrone_initialised_fixture):
     np.testing.assert_allclose(unscale_scale, EXPECT_X_TILDE_BR)
     assert scaling.scale_x(EXPECT_X_BR).all() >= -0.5
     assert scaling.scale_x(EXPECT_X_BR).all() <= 0.5
+
+
+def test_initialise_none_scaling_br(brachistochrone_fixture):
+    """Identity variable scaling is stored as scalars when not scaling."""
+    ocp, _ = brachistochrone_fixture
+    ocp.settings.scaling_method = None
+    iteration = initialise_first_iteration(ocp)
+    scaling = pycollo.scaling.CasadiIterationScaling(iteration)
+
+    assert scaling.V == 1.0
+    assert scaling.r == 0.0
+    np.testing.assert_array_equal(scaling.V_ocp, np.ones(5))
+    np.testing.assert_array_equal(scaling.r_ocp, np.zeros(5))
+    np.testing.assert_array_equal(scaling.scale_x(EXPECT_X_BR), EXPECT_X_BR)
+    np.testing.assert_array_equal(scaling.unscale_x(EXPECT_X_BR), EXPECT_X_BR)
+    assert scaling.scale_x(EXPECT_X_BR) is EXPECT_X_BR
+    sH = sparse.identity(iteration.num_x, format="coo")
+    sH_tilde = scaling.scale_H(sH)
+    assert sparse.isspmatrix_csr(sH_tilde)
+    np.testing.assert_array_equal(sH_tilde.toarray(), sH.toarray())
+
+
+def test_none_scaling_update_br(brachistochrone_fixture):
+    """Updated variable scaling is applied after starting from the identity."""
+    ocp, _ = brachistochrone_fixture
+    ocp.settings.scaling_method = None
+    ocp.settings.update_scaling = True
+    iteration = initialise_first_iteration(ocp)
+    scaling = pycollo.scaling.CasadiIterationScaling(iteration)
+    assert scaling.scale_x(EXPECT_X_BR) is EXPECT_X_BR
+
+    scaling.V_ocp = np.linspace(1.0, 2.0, 5)
+    scaling.r_ocp = np.linspace(-1.0, 1.0, 5)
+    scaling._expand_V_r_to_mesh()
+    x_tilde = scaling.scale_x(EXPECT_X_BR)
+    assert scaling.V.shape == (iteration.num_x, )
+    np.testing.assert_allclose(x_tilde,
+                               (EXPECT_X_BR - scaling.r) / scaling.V)
+    np.testing.assert_allclose(scaling.unscale_x(x_tilde), EXPECT_X_BR,
+                               atol=1e-15)
+    sH = sparse.identity(iteration.num_x, format="csr")
+    np.testing.assert_allclose(scaling.scale_H(sH).diagonal(),
+                               scaling.V**2)
+
+
+def test_scale_G_H_br(brachistochrone_initialised_fixture):
+    """Jacobian/Hessian scaling matches dense reference and stays sparse."""
+    ocp, iteration, scaling = brachistochrone_initialised_fixture
+    scaling.__init__(iteration)
+    rng = np.random.default_rng(0)
+    scaling.W = rng.random(iteration.num_c) + 0.5
+    sG = sparse.random(iteration.num_c, iteration.num_x, density=0.1,
+                       format="csr", random_state=0)
+    sH = sparse.tril(sparse.random(iteration.num_x, iteration.num_x,
+                                   density=0.1, random_state=1))
+
+    sG_tilde = scaling.scale_G(sG)
+    sH_tilde = scaling.scale_H(sH)
+
+    assert sparse.isspmatrix_csc(sG_tilde)
+    assert sparse.isspmatrix_csr(sH_tilde)
+    expect_G = np.diag(scaling.W) @ sG.toarray() @ np.diag(scaling.V)
+    expect_H = np.diag(scaling.V) @ sH.toarray() @ np.diag(scaling.V)
+    np.testing.assert_allclose(sG_tilde.toarray(), expect_G)
+    np.testing.assert_allclose(sH_tilde.toarray(), expect_H)
+
+
+def test_scale_unscale_x_out_br(brachistochrone_initialised_fixture):
+    """Fused scale/unscale kernels match NumPy and honour `out`."""
+    ocp, iteration, scaling = brachistochrone_initialised_fixture
+    scaling.__init__(iteration)
+    x_tilde = scaling.scale_x(EXPECT_X_BR)
+    np.testing.assert_array_equal(
+        x_tilde, scaling.V_inv * (EXPECT_X_BR - scaling.r))
+    np.testing.assert_array_equal(
+        scaling.unscale_x(x_tilde), scaling.V * x_tilde + scaling.r)
+    assert scaling.scale_x(EXPECT_X_BR) is not x_tilde
+
+    out = np.empty_like(EXPECT_X_BR)
+    assert scaling.unscale_x(x_tilde, out=out) is out
+    np.testing.assert_allclose(out, EXPECT_X_BR)
+
+
+def test_variable_scaling_block_br(brachistochrone_initialised_fixture):
+    """Stretch, unstretch and shift are rows of one contiguous block."""
+    ocp, iteration, scaling = brachistochrone_initialised_fixture
+    scaling.__init__(iteration)
+    assert scaling.V.base is scaling.V_inv.base is scaling.r.base
+    assert scaling.V.base.shape == (3, iteration.num_x)
+    assert scaling.V.base.flags.c_contiguous
+    np.testing.assert_array_equal(scaling.V_inv, 1 / scaling.V)
+    assert not scaling.V_inv.flags.writeable
+
+
+def test_scale_g_br(brachistochrone_initialised_fixture):
+    """Gradient scaling is element-wise, not a dot product."""
+    ocp, iteration, scaling = brachistochrone_initialised_fixture
+    scaling.__init__(iteration)
+    scaling.w = 0.5
+    g = np.linspace(-1.0, 1.0, iteration.num_x)
+    g_tilde = scaling.scale_g(g)
+    assert g_tilde.shape == (iteration.num_x, )
+    np.testing.assert_allclose(g_tilde, 0.5 * scaling.V * g)
+    out = np.empty(iteration.num_x)
+    assert scaling.scale_g(g, out=out) is out
+    np.testing.assert_array_equal(out, g_tilde)
+
+
+@pytest.mark.parametrize("alpha", [0.8, 0.3, 1.0])
+def test_running_scaling_history(alpha):
+    """Running sums reproduce the weighted average of the scaling history.
+
+    Each iteration's scaling is checked against the average of all previous
+    iterations' (averaged) scalings and its own, with weight `alpha` on the
+    newest and `alpha * (1 - alpha)**i` on older, as computed directly.
+
+    """
+    rng = np.random.default_rng(0)
+    ocp = SimpleNamespace(settings=SimpleNamespace(scaling_weight=alpha))
+    backend = SimpleNamespace(mesh_iterations=[])
+    history = {"w": [], "V_ocp": [], "r_ocp": [], "W_ocp": []}
+    for index in range(4):
+        latest = {"w": rng.random() + 0.5,
+                  "V_ocp": rng.random(3) + 0.5,
+                  "r_ocp": rng.random(3) - 0.5,
+                  "W_ocp": rng.random(4) + 0.5}
+        scaling = object.__new__(pycollo.scaling.IterationScaling)
+        scaling.iteration = SimpleNamespace(number=index + 1, index=index,
+                                            optimal_control_problem=ocp)
+        scaling.backend = backend
+        prev_scaling = scaling._previous_iteration_scaling()
+        weights = np.flip([alpha * (1 - alpha)**i for i in range(index + 1)])
+        weights[0] /= alpha
+        for name, value in latest.items():
+            if prev_scaling is None:
+                averaged = value
+            else:
+                running = getattr(prev_scaling, f"_{name}_running")
+                averaged = running + alpha * value
+            expect = np.average(np.array(history[name] + [value]), axis=0,
+                                weights=weights)
+            np.testing.assert_allclose(averaged, expect)
+            history[name].append(expect)
+            setattr(scaling, name, averaged)
+        scaling._update_running_scaling()
+        backend.mesh_iterations.append(SimpleNamespace(scaling=scaling))
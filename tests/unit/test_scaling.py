@@ -3,6 +3,8 @@
 
 import numpy as np
 
+import pycollo
+
 
 def test_none_scaling_init_correct_dp_specific(double_pendulum_fixture):
     """Check OCP scaling initialised correctly using none scaling method."""
@@ -120,3 +122,91 @@ def test_bounds_scaling_init_correct_br_specific(brachistochrone_fixture):
     np.testing.assert_allclose(scaling.x_scales, expect_x_scales)
     np.testing.assert_allclose(scaling.x_shifts, expect_x_shifts)
     np.testing.assert_allclose(scaling.c_scales, expect_c_scales)
+
+
+def test_constraint_variable_indices_br_specific(brachistochrone_fixture):
+    """Check defect/integral constraints map to their scaling variables."""
+    ocp, user_syms = brachistochrone_fixture
+    ocp.settings.scaling_method = "bounds"
+    ocp._console_out_initialisation_message()
+    ocp._check_variables_and_equations()
+    ocp._initialise_backend()
+    ocp._check_problem_and_phase_bounds()
+    ocp._initialise_scaling()
+
+    backend = ocp._backend
+    scaling = backend.scaling
+    c_indices, x_indices = scaling.c_x_indices
+
+    np.testing.assert_array_equal(c_indices, np.array([0, 1, 2]))
+    np.testing.assert_array_equal(x_indices, np.array([0, 1, 2]))
+    np.testing.assert_array_equal(scaling.c_scales[c_indices],
+                                  scaling.x_scales[x_indices])
+
+
+def test_column_amplitude_centre():
+    """Check single-pass column amplitude/centre including degenerate cols."""
+    var = np.array([[0.0, 2.0, -1.0],
+                    [4.0, 2.0, -3.0],
+                    [1.0, 2.0, 5.0]])
+    amp = np.empty(3)
+    centre = np.empty(3)
+    pycollo.scaling._column_amplitude_centre(var, amp, centre)
+
+    np.testing.assert_array_equal(amp, np.array([4.0, 1.0, 8.0]))
+    np.testing.assert_array_equal(centre, np.array([2.0, 2.0, 1.0]))
+
+
+def test_row_sum_squares():
+    """Check row sums of squares from unordered sparse nonzeros."""
+    row = np.array([0, 3, 0, 3, 1])
+    data = np.array([2.0, 3.0, 1.0, 1.0, 6.0])
+    out = np.full(4, np.nan)
+    pycollo.scaling._row_sum_squares(row, data, out)
+
+    np.testing.assert_array_equal(out, np.array([5.0, 36.0, 0.0, 10.0]))
+
+
+def test_expand_by_table():
+    """Check table-driven block repeat expansion of basis scaling."""
+    base = np.array([1.0, 2.0, 3.0, 4.0])
+    table = np.array([[0, 2, 0, 3], [2, 3, 6, 1], [3, 4, 7, 2]])
+    out = np.full(9, np.nan)
+    pycollo.scaling._expand_by_table(table, base, out)
+
+    expected = np.array([1.0, 1.0, 1.0, 2.0, 2.0, 2.0, 3.0, 4.0, 4.0])
+    np.testing.assert_array_equal(out, expected)
+
+
+def test_np_print(capsys):
+    """Check signed scientific printing of array values one per line."""
+    pycollo.scaling.np_print(np.array([1.5, -0.25, -0.0]))
+    captured = capsys.readouterr()
+
+    assert captured.out == ("+1.500000000000000e+00,\n"
+                            "-2.500000000000000e-01,\n"
+                            "+0.000000000000000e+00,\n")
+
+    pycollo.scaling.np_print(val for val in (2.0, -3.0))
+    captured = capsys.readouterr()
+
+    assert captured.out == ("+2.000000000000000e+00,\n"
+                            "-3.000000000000000e+00,\n")
+
+
+def test_scale_compressed():
+    """Check single-pass two-sided diagonal scaling of CSR nonzeros."""
+    A = np.array([[1.0, 0.0, 2.0],
+                  [0.0, 0.0, 0.0],
+                  [3.0, 4.0, 0.0]])
+    outer = np.array([2.0, 5.0, -1.0])
+    inner = np.array([1.0, 0.5, 10.0])
+    indptr = np.array([0, 2, 2, 4])
+    indices = np.array([0, 2, 0, 1])
+    data = np.array([1.0, 2.0, 3.0, 4.0])
+    out = np.full(4, np.nan)
+    pycollo.scaling._scale_compressed(indptr, indices, data, outer, inner,
+                                      out)
+
+    expected = (np.diag(outer) @ A @ np.diag(inner))[A != 0]
+    np.testing.assert_array_equal(out, expected)